@@ -34,12 +34,22 @@ import re
 import shutil
 import queue
 import threading
+import multiprocessing
+import time
 import json
+import mmap
+import marshal
+import hashlib
+import operator
 import webbrowser
 import xml.etree.ElementTree as ET
 from pathlib import Path
-from collections import Counter, defaultdict
-from typing import Dict, Any, List, Optional, Tuple, Set
+from collections import Counter, defaultdict, deque, namedtuple
+from contextlib import contextmanager
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, Any, List, Optional, Tuple, Set, Union
 
 # Attempt to import GUI libraries. This will determine the mode.
 try:
@@ -49,6 +59,24 @@ try:
 except ImportError:
     GUI_AVAILABLE = False
 
+# Prefer lxml (libxml2) for streaming full.xml; fall back to the stdlib parser.
+try:
+    from lxml import etree as LET
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# orjson is optional too; presets fall back to the stdlib json module.
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    ORJSON_AVAILABLE = False
+
+# Without lxml, the stdlib parser is only fast when backed by the C accelerator
+# (_elementtree). CPython always has it; PyPy and some embedded builds do not.
+ET_ACCELERATED = ET.Element is not getattr(ET, "_Element_Py", ET.Element)
+
 # -------------------------------
 # PyInstaller Path Helper
 # -------------------------------
@@ -165,19 +193,25 @@ def get_user_inputs_cli() -> Dict[str,Any]:
 # Core filtering utilities
 # -------------------------------
 CONTROL_KEYWORDS = {
-    "joystick": {"joy", "joystick"}, "trackball": {"trackball"}, "spinner": {"spinner"}, 
-    "dial": {"dial"}, "paddle": {"paddle"}, "lightgun": {"lightgun", "gun"}, 
-    "positional": {"positional"}, "mouse": {"mouse"}, "pedal": {"pedal"}, 
-    "stick (analog)": {"analog"}, "keyboard": {"keyboard"}, "buttons only": {"buttons only"}, 
-    "other": {"other"}
+    "joystick": frozenset({"joy", "joystick"}), "trackball": frozenset({"trackball"}), "spinner": frozenset({"spinner"}), 
+    "dial": frozenset({"dial"}), "paddle": frozenset({"paddle"}), "lightgun": frozenset({"lightgun", "gun"}), 
+    "positional": frozenset({"positional"}), "mouse": frozenset({"mouse"}), "pedal": frozenset({"pedal"}), 
+    "stick (analog)": frozenset({"analog"}), "keyboard": frozenset({"keyboard"}), "buttons only": frozenset({"buttons only"}), 
+    "other": frozenset({"other"})
 }
-DIRECTION_MAP = {"4-way": {"4"}, "8-way": {"8"}, "2-way horizontal": {"2h","2-h","2 horizontal"}, "2-way vertical": {"2v","2-v","2 vertical"}, "49-way": {"49"}, "rotary": {"rotary","12-way"}, "analog": {"analog"}}
+DIRECTION_MAP = {"4-way": frozenset({"4"}), "8-way": frozenset({"8"}), "2-way horizontal": frozenset({"2h","2-h","2 horizontal"}), "2-way vertical": frozenset({"2v","2-v","2 vertical"}), "49-way": frozenset({"49"}), "rotary": frozenset({"rotary","12-way"}), "analog": frozenset({"analog"})}
 KNOWN_LANGUAGES = {'english', 'japanese', 'spanish', 'french', 'german', 'italian', 'korean', 'chinese', 'dutch', 'en', 'ja', 'es', 'fr', 'de', 'it', 'ko', 'zh', 'nl'}
-BOOTLEG_PATTERNS = ['bootleg', 'hack']
-PROTOTYPE_PATTERNS = ['prototype', 'beta', 'demo']
+BOOTLEG_PATTERNS = ('bootleg', 'hack')
+PROTOTYPE_PATTERNS = ('prototype', 'beta', 'demo')
+MATURE_PATTERNS = ("mature", "adult", "mahjong (strip)", "erotic", "nsfw", "xxx", "(nude)")
+
+# Each pattern list collapses into one alternation so a description is scanned once, in C.
+BOOTLEG_RE = re.compile("|".join(map(re.escape, BOOTLEG_PATTERNS)))
+PROTOTYPE_RE = re.compile("|".join(map(re.escape, PROTOTYPE_PATTERNS)))
+MATURE_RE = re.compile("|".join(map(re.escape, MATURE_PATTERNS)))
 
 # --- EXPERT MAME FILTERING ---
-NON_ARCADE_SOURCE_FILES = {
+NON_ARCADE_SOURCE_FILES = frozenset({
     # Consoles & Handhelds
     "genesis.cpp", "nes.cpp", "snes.cpp", "gamegear.cpp", "gameboy.cpp", "lynx.cpp",
     "pce.cpp", "a2600.cpp", "coleco.cpp", "intv.cpp", "odyssey2.cpp", "vectrex.cpp",
@@ -186,248 +220,489 @@ NON_ARCADE_SOURCE_FILES = {
     # Computers
     "msx.cpp", "spectrum.cpp", "c64.cpp", "amiga.cpp", "ti99.cpp", "x1.cpp", "coco.cpp",
     "apple2.cpp", "mac.cpp", "pc.cpp", "fm7.cpp"
-}
+})
+
+MACHINE_TAGS = ("machine", "game")
+
+# Copy pipeline: worker threads overlap the blocking read/write syscalls, and at most
+# COPY_MAX_INFLIGHT copies are queued before we wait on a completion.
+# Callers of run_sort can override the worker count with a "copy_workers" config entry;
+# it is a programmatic option only (the GUI, presets and CLI neither set nor save it).
+COPY_WORKERS = min(32, (os.cpu_count() or 4) * 4)
+COPY_MAX_INFLIGHT = 64
+COPY_PROGRESS_STEPS = 200  # at most this many progress updates per copy run
+
+# Windows: before 3.12, shutil.copy2 streams through a userspace buffer. CopyFileExW
+# keeps the transfer in the kernel. Elsewhere shutil already uses sendfile/fcopyfile.
+_CopyFileExW = None
+if sys.platform == "win32" and sys.version_info < (3, 12):
+    try:
+        import ctypes
+        from ctypes import wintypes
+        _CopyFileExW = ctypes.WinDLL("kernel32", use_last_error=True).CopyFileExW
+        _CopyFileExW.argtypes = (wintypes.LPCWSTR, wintypes.LPCWSTR, ctypes.c_void_p,
+                                 ctypes.c_void_p, ctypes.c_void_p, wintypes.DWORD)
+        _CopyFileExW.restype = wintypes.BOOL
+    except (ImportError, OSError, AttributeError):
+        _CopyFileExW = None
+
+# Plain-value snapshot of one machine — everything the filter kernel reads, no XML objects.
+MachineRecord = namedtuple("MachineRecord", "name description category cloneof bios players buttons rotate "
+                                            "driver_status ctrl_types ctrl_ways chds samples")
+
+# Per-run filter settings, resolved once from the config dict.
+FilterRules = namedtuple("FilterRules", "players buttons orientation working_only mature include_clones "
+                                        "include_bootlegs include_prototypes control_kws direction_tokens "
+                                        "region_pref language_pref")
+
+# Bump whenever MachineRecord, _extract_machine or _rejected_by_attributes changes, so stale
+# parse caches are ignored. Attribute rejects are left out of the cache, which is why edits to
+# NON_ARCADE_SOURCE_FILES are also covered by the blocklist digest in the cache key.
+PARSE_CACHE_VERSION = 2
+
+# Compact per-machine record kept for sorting; the first four fields are the sort key.
+MatchedMachine = namedtuple("MatchedMachine", "clone_score region_score language_score name description bios chds samples")
+
+# Child tags _extract_machine reads; everything else (rom, device_ref, dipswitch…) is skipped.
+_RECORD_TAGS = frozenset({"description", "category", "input", "display", "driver", "control", "disk", "sample"})
 
 def _status(status_q, msg):
     if status_q is not None:
         status_q.put(("status", msg))
 
-def is_actually_an_arcade_machine(machine_element) -> bool:
-    """A multi-layered check to reliably identify arcade machines."""
-    
+class BatchedStatus:
+    """Wraps a status queue so high-frequency progress lines reach the GUI at most every `interval` seconds.
+
+    put() forwards immediately, so warnings and errors sent through _status() are
+    never delayed. update() only keeps the newest progress line, and flush() posts
+    whatever is still pending. Meant for a single producer thread.
+    """
+    def __init__(self, status_q, interval: float = 0.1):
+        self.status_q = status_q
+        self.interval = interval
+        self._pending = None
+        self._last_post = 0.0
+
+    def put(self, item):
+        if self.status_q is not None: self.status_q.put(item)
+
+    def update(self, msg: str):
+        self._pending = msg
+        now = time.monotonic()
+        if now - self._last_post >= self.interval:
+            self._last_post = now
+            self.flush()
+
+    def flush(self):
+        if self._pending is not None:
+            _status(self.status_q, self._pending)
+            self._pending = None
+
+@contextmanager
+def _mapped_xml(xml_path: Path):
+    """Yields full.xml as a read-only memory map, or the plain file if it can't be mapped."""
+    with open(xml_path, "rb") as f:
+        try:
+            mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):  # empty file, or a share that refuses mmap
+            yield f
+            return
+        with mapped:
+            # Read front-to-back once: ask for aggressive readahead (POSIX only).
+            if hasattr(mmap, "MADV_SEQUENTIAL"): mapped.madvise(mmap.MADV_SEQUENTIAL)
+            yield mapped
+
+def _iter_machines(xml_path: Path):
+    """Streams <machine>/<game> elements from full.xml, freeing each one once processed."""
+    with _mapped_xml(xml_path) as source:
+        if LXML_AVAILABLE:
+            for _, elem in LET.iterparse(source, events=("end",), tag=MACHINE_TAGS):
+                yield elem
+                elem.clear()
+                while elem.getprevious() is not None: del elem.getparent()[0]
+        else:
+            # "end" events only: the parser skips building start events for every child.
+            # Cleared machines leave an empty shell behind in the root (a few MB for a
+            # full set), which is cheaper than tracking the root through start events.
+            parser = ET.XMLParser(target=ET.TreeBuilder())
+            for _, elem in ET.iterparse(source, events=("end",), parser=parser):
+                if elem.tag not in MACHINE_TAGS: continue
+                yield elem
+                elem.clear()
+
+NON_ARCADE_CATEGORY_KEYWORDS = ("console", "handheld", "computer", "system")
+
+def _rejected_by_attributes(attrib) -> bool:
+    """Quick Rejects + Layer 1 of the arcade check: attribute reads only, no child lookups."""
     # --- Quick Rejects ---
-    if machine_element.get("isdevice") == "yes": return False
-    if machine_element.get("ismechanical") == "yes": return False
-    if machine_element.get("isbios") == "yes": return False
-    if machine_element.get("runnable") == "no": return False
+    if (attrib.get("isdevice") == "yes" or attrib.get("ismechanical") == "yes"
+            or attrib.get("isbios") == "yes" or attrib.get("runnable") == "no"):
+        return True
 
     # --- Layer 1: Source File Heuristic (Most Important) ---
-    source_file = machine_element.get("sourcefile")
-    if source_file in NON_ARCADE_SOURCE_FILES:
-        return False
-
-    # --- Layer 2: Category Check ---
-    category_tag = machine_element.find("category")
-    if category_tag is not None and category_tag.text:
-        category_text = category_tag.text.lower()
-        if any(keyword in category_text for keyword in ["console", "handheld", "computer", "system"]):
-            return False
-            
-    # If it passes all checks, it's very likely an arcade machine.
-    return True
-
-def _good_driver_status(driver) -> bool:
-    if driver is None: return True
-    status = (driver.get("status") or "").lower().strip()
+    # Newer MAME builds prefix the driver with its folder ("nintendo/nes.cpp"), so the
+    # blocklist is checked against both the full path and the bare file name.
+    source_file = attrib.get("sourcefile") or ""
+    return source_file in NON_ARCADE_SOURCE_FILES or source_file.rpartition("/")[2] in NON_ARCADE_SOURCE_FILES
+
+def _rejected_by_category(cat_lower: str) -> bool:
+    """Layer 2 of the arcade check."""
+    return any(keyword in cat_lower for keyword in NON_ARCADE_CATEGORY_KEYWORDS)
+
+def _good_driver_status(status: Optional[str]) -> bool:
+    if status is None: return True
+    status = status.lower().strip()
     return not status or status in {"good", "perfect"}
 
-def _match_orientation(display, want: str) -> bool:
-    if want == "both" or display is None: return True
-    rotate = (display.get("rotate") or "0").strip()
-    try: r = int(rotate)
-    except Exception: r = 0
-    is_vertical = r in (90, 270)
+def _match_orientation(rotate: Optional[int], want: str) -> bool:
+    if want == "both" or rotate is None: return True
+    is_vertical = rotate in (90, 270)
     if want == "vertical": return is_vertical
     if want == "horizontal": return not is_vertical
     return True
 
-def _collect_control_tokens(machine) -> (set, set):
-    types, dirs = set(), set()
-    input_tag = machine.find("input")
-    if input_tag is not None:
-        for ctrl in input_tag.findall("control"):
-            ctype = (ctrl.get("type") or "").lower()
-            ways = (ctrl.get("ways") or ctrl.get("ways2") or ctrl.get("ways3") or "").lower()
-            if ctype: types.add(ctype)
-            if ways: dirs.add(ways)
-    ctrl2 = machine.find("control")
-    if ctrl2 is not None:
-        ctype = (ctrl2.get("type") or "").lower()
-        ways = (ctrl2.get("ways") or "").lower()
-        if ctype: types.add(ctype)
-        if ways: dirs.add(ways)
-    return types, dirs
-
-def _controls_ok(config_controls: List[str], machine) -> bool:
-    if not config_controls: return True
-    types, _ = _collect_control_tokens(machine)
-    if not types: return True
-    for want in config_controls:
-        kws = CONTROL_KEYWORDS.get(want.lower(), {want.lower()})
-        for t in types:
-            if any(kw in t.lower() for kw in kws): return True
-    return False
-
-def _directions_ok(config_dirs: List[str], machine) -> bool:
-    if not config_dirs: return True
-    _, dirs = _collect_control_tokens(machine)
-    if not dirs: return True
-    for want in config_dirs:
-        tokens = DIRECTION_MAP.get(want, {want.lower()})
-        for d in dirs:
-            if any(tok in d.lower() for tok in tokens): return True
-    return False
-
-def _players_ok(limit: int, machine) -> bool:
-    if limit >= 99 or machine.find("input") is None: return True
-    try: return int(machine.find("input").get("players")) <= int(limit)
-    except Exception: return True
-
-def _buttons_ok(limit: int, machine) -> bool:
-    if limit >= 99 or machine.find("input") is None: return True
-    try: return int(machine.find("input").get("buttons")) <= int(limit)
-    except Exception: return True
-
-def _clone_status(machine) -> Tuple[int, bool]:
-    cloneof = machine.get("cloneof")
+def _control_tokens(ctrl, types: set, dirs: set) -> None:
+    attrib = ctrl.attrib
+    ctype = (attrib.get("type") or "").lower()
+    ways = (attrib.get("ways") or attrib.get("ways2") or attrib.get("ways3") or "").lower()
+    if ctype: types.add(ctype)
+    if ways: dirs.add(ways)
+
+def _control_keywords(config_controls: List[str]) -> Tuple[str, ...]:
+    """Flattens the selected control types into one tuple of lower-case keywords, once per run."""
+    kws = set()
+    for want in config_controls or ():
+        want = want.lower()
+        kws.update(CONTROL_KEYWORDS.get(want, (want,)))
+    return tuple(kws)
+
+def _direction_tokens(config_dirs: List[str]) -> Tuple[str, ...]:
+    """Flattens the selected joystick directions into one tuple of lower-case tokens, once per run."""
+    tokens = set()
+    for want in config_dirs or ():
+        tokens.update(DIRECTION_MAP.get(want, (want.lower(),)))
+    return tuple(tokens)
+
+def _controls_ok(control_kws: Tuple[str, ...], types: Tuple[str, ...]) -> bool:
+    if not control_kws or not types: return True
+    # Substring match on purpose: "joy" must also cover "doublejoy", "gun" covers "lightgun".
+    return any(kw in t for t in types for kw in control_kws)
+
+def _directions_ok(direction_tokens: Tuple[str, ...], dirs: Tuple[str, ...]) -> bool:
+    if not direction_tokens or not dirs: return True
+    return any(tok in d for d in dirs for tok in direction_tokens)
+
+def _players_ok(limit: int, players: Optional[int]) -> bool:
+    if limit >= 99 or players is None: return True
+    return players <= limit
+
+def _buttons_ok(limit: int, buttons: Optional[int]) -> bool:
+    if limit >= 99 or buttons is None: return True
+    return buttons <= limit
+
+def _clone_status(cloneof: Optional[str], desc_lower: str) -> Tuple[int, bool]:
     if not cloneof:
         return 0, False # Parent
     
-    desc = machine.findtext("description", "").lower()
-    
-    is_bootleg = any(p in desc for p in BOOTLEG_PATTERNS)
+    is_bootleg = BOOTLEG_RE.search(desc_lower) is not None
     if is_bootleg:
         return 2, True # Bootleg
     
-    is_prototype = any(p in desc for p in PROTOTYPE_PATTERNS)
+    is_prototype = PROTOTYPE_RE.search(desc_lower) is not None
     if is_prototype:
         return 3, True # Prototype
         
     return 1, False # Official Clone
 
-def _mature_ok(include_mature: bool, machine) -> bool:
-    cat = machine.find("category")
-    desc = machine.findtext("description", "")
-    blob = f"{cat.text if cat is not None else ''} {desc or ''}".lower()
-    if any(x in blob for x in ["mature","adult","mahjong (strip)","erotic","nsfw","xxx", "(nude)"]):
+def _mature_ok(include_mature: bool, cat_lower: str, desc_lower: str) -> bool:
+    if MATURE_RE.search(cat_lower) or MATURE_RE.search(desc_lower):
         return include_mature
     return True
 
-def _region_score(name: str, desc: str, region_order: List[str]) -> int:
-    if not region_order: return 0
-    text = f"{name} {desc}".lower()
-    for idx, token in enumerate(region_order):
-        if token.strip().lower() in text: return idx
-    return len(region_order) + 1
-
-def parse_full_xml(xml_path: Path, config: Dict[str,Any], debug_path: Path, status_q=None) -> List[Dict[str,Any]]:
-    tree = ET.parse(xml_path)
-    root = tree.getroot()
-    entries = list(root.findall("machine")) or list(root.findall("game"))
-    _status(status_q, f"XML loaded: {len(entries)} entries detected…")
+def _compile_preference(order: List[str]):
+    """Compiles a region/language preference list into (regex, rank map, miss score).
+
+    The alternation sits in a lookahead so every position is tried, and lists
+    tokens best-first so a shorter, preferred prefix wins at a shared position.
+    The lowest rank across all hits therefore equals the first listed token found.
+    """
+    if not order: return None
+    ranks = {}
+    for idx, token in enumerate(order): ranks.setdefault(token, idx)
+    pattern = re.compile("(?=(" + "|".join(map(re.escape, order)) + "))")
+    return pattern, ranks, len(order) + 1
+
+def _preference_score(pref, text: str) -> int:
+    if pref is None: return 0
+    pattern, ranks, miss = pref
+    return min((ranks[hit.group(1)] for hit in pattern.finditer(text)), default=miss)
+
+def _int_or_none(value: Optional[str]) -> Optional[int]:
+    try: return int(value)
+    except (TypeError, ValueError): return None
+
+def _extract_machine(m) -> MachineRecord:
+    """Reads the fields the filter kernel needs out of a <machine> element in one pass over its children.
+
+    Like the find() calls it replaces, only the first <description>, <category>,
+    <input>, <display>, <driver> and top-level <control> count; disks and samples
+    are collected in full.
+    """
+    attrib = m.attrib
+    description = category = input_tag = display = driver = legacy_control = None
+    chds, samples = [], []
+    for child in m:
+        tag = child.tag
+        if tag not in _RECORD_TAGS: continue
+        if tag == "disk": chds.append(child.get("name"))
+        elif tag == "sample": samples.append(child.get("name"))
+        elif tag == "description":
+            if description is None: description = child.text or ""
+        elif tag == "category":
+            if category is None: category = child.text or ""
+        elif tag == "input":
+            if input_tag is None: input_tag = child
+        elif tag == "display":
+            if display is None: display = child
+        elif tag == "driver":
+            if driver is None: driver = child
+        elif legacy_control is None: legacy_control = child
 
+    types, dirs = set(), set()
+    players = buttons = None
+    if input_tag is not None:
+        input_attrib = input_tag.attrib
+        players, buttons = _int_or_none(input_attrib.get("players")), _int_or_none(input_attrib.get("buttons"))
+        for ctrl in input_tag:
+            if ctrl.tag == "control": _control_tokens(ctrl, types, dirs)
+    if legacy_control is not None: _control_tokens(legacy_control, types, dirs)
+    rotate = None if display is None else (_int_or_none((display.get("rotate") or "0").strip()) or 0)
+    if attrib.get("sampleof"): samples.append(attrib.get("sampleof"))
+    return MachineRecord(
+        name=attrib.get("name") or "", description=description or "", category=category or "",
+        cloneof=attrib.get("cloneof"), bios=attrib.get("romof"),
+        players=players, buttons=buttons, rotate=rotate,
+        driver_status=None if driver is None else (driver.get("status") or ""),
+        ctrl_types=tuple(types), ctrl_ways=tuple(dirs), chds=tuple(chds), samples=tuple(dict.fromkeys(samples)))
+
+def _build_filter_rules(config: Dict[str,Any]) -> FilterRules:
+    """Resolves every config lookup, default and type conversion once per run, not once per machine."""
+    return FilterRules(
+        players=int(config.get("players", 99)), buttons=int(config.get("max_buttons", 99)),
+        orientation=config.get("orientation", "both"), working_only=bool(config.get("working_only", False)),
+        mature=bool(config.get("mature", False)), include_clones=bool(config.get("include_clones")),
+        include_bootlegs=bool(config.get("include_bootlegs")), include_prototypes=bool(config.get("include_prototypes")),
+        control_kws=_control_keywords(config.get("controls") or ()),
+        direction_tokens=_direction_tokens(config.get("directions") or ()),
+        region_pref=_compile_preference(tuple(t.strip().lower() for t in config.get("region_order") or ())),
+        language_pref=_compile_preference(tuple(config.get("language_order") or ())))
+
+def _filter_one(rec: MachineRecord, rules: FilterRules) -> Tuple[Optional[str], int, int, int]:
+    """The per-machine filter kernel: (skip reason or None, clone, region, language scores).
+
+    It only touches plain str/int/tuple values, so it runs unchanged on cached
+    records and can be compiled (Cython pure-Python mode, mypyc) on its own.
+    Checks run cheapest-reject first.
+    """
+    if not _players_ok(rules.players, rec.players): return "players", 0, 0, 0
+    if not _buttons_ok(rules.buttons, rec.buttons): return "buttons", 0, 0, 0
+    if not _match_orientation(rec.rotate, rules.orientation): return "orientation", 0, 0, 0
+    if rules.working_only and not _good_driver_status(rec.driver_status): return "not_working", 0, 0, 0
+    
+    # Lower-case each text field once; the scoring helpers all share these.
+    cat_lower = rec.category.lower()
+    if _rejected_by_category(cat_lower): return "not_arcade", 0, 0, 0
+    desc_lower = rec.description.lower()
+    clone_score, is_unwanted_type = _clone_status(rec.cloneof, desc_lower)
+    if clone_score == 1 and not rules.include_clones: return "clone_type", 0, 0, 0
+    if clone_score == 2 and not rules.include_bootlegs: return "clone_type", 0, 0, 0
+    if clone_score == 3 and not rules.include_prototypes: return "clone_type", 0, 0, 0
+    if not _mature_ok(rules.mature, cat_lower, desc_lower): return "mature", 0, 0, 0
+    if not _controls_ok(rules.control_kws, rec.ctrl_types): return "controls", 0, 0, 0
+    if not _directions_ok(rules.direction_tokens, rec.ctrl_ways): return "directions", 0, 0, 0
+    
+    text_lower = f"{rec.name.lower()} {desc_lower}"
+    return None, clone_score, _preference_score(rules.region_pref, text_lower), _preference_score(rules.language_pref, text_lower)
+
+def _user_cache_dir() -> Path:
+    """Per-user cache folder; the MAME folder itself may be read-only or a downloaded bundle."""
+    base = os.environ.get("LOCALAPPDATA") if sys.platform == "win32" else os.environ.get("XDG_CACHE_HOME")
+    return Path(base or Path.home() / ".cache") / "mame_sorter"
+
+def _cache_file(kind: str, xml_path: Path, suffix: str) -> Path:
+    """Cache file for one full.xml, named by a hash of its absolute path."""
+    digest = hashlib.blake2b(str(xml_path.resolve()).encode("utf-8"), digest_size=8).hexdigest()
+    return _user_cache_dir() / f"{kind}-{digest}{suffix}"
+
+_BLOCKLIST_DIGEST = hashlib.blake2b("\n".join(sorted(NON_ARCADE_SOURCE_FILES)).encode("utf-8"), digest_size=8).hexdigest()
+
+def _load_machine_records(xml_path: Path, status_q=None) -> Tuple[int, int, List[MachineRecord]]:
+    """Returns (entries parsed, attribute rejects, candidate records) for full.xml.
+
+    Only the config-independent work is cached: machines rejected by attributes
+    are counted but not stored. The cache lives in the per-user cache folder and is
+    keyed by full.xml's path, size and mtime, so a new MAME release invalidates it
+    automatically. It is stored with marshal, which only decodes plain values and
+    never runs code, so a planted cache file can't execute anything.
+    """
+    st = xml_path.stat()
+    cache_key = (PARSE_CACHE_VERSION, _BLOCKLIST_DIGEST, str(xml_path.resolve()), st.st_size, st.st_mtime_ns)
+    cache_path = _cache_file("parse", xml_path, ".marshal")
+    try:
+        with open(cache_path, "rb") as f:
+            if marshal.load(f) == cache_key:
+                parsed_count, rejected, rows = marshal.load(f)
+                _status(status_q, f"⚡ Using cached parse of {xml_path.name}.")
+                return parsed_count, rejected, [MachineRecord._make(row) for row in rows]
+    except FileNotFoundError:
+        pass
+    except Exception as e:
+        _status(status_q, f"⚠️ Ignoring unreadable parse cache: {e}")
+
+    if not LXML_AVAILABLE and not ET_ACCELERATED:
+        _status(status_q, "⚠️ lxml and the C XML accelerator are unavailable — parsing will be slow.")
+
+    parsed_count, rejected, records = 0, 0, []
+    for m in _iter_machines(xml_path):
+        parsed_count += 1
+        # Attribute-only rejects (devices, BIOS, blocklisted drivers) skip extraction entirely.
+        if _rejected_by_attributes(m.attrib): rejected += 1; continue
+        records.append(_extract_machine(m))
+
+    # marshal only handles builtin types, so rows are stored as plain tuples.
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "wb") as f:
+            marshal.dump(cache_key, f)
+            marshal.dump((parsed_count, rejected, [tuple(r) for r in records]), f)
+        os.replace(tmp_path, cache_path)
+    except OSError as e:
+        _status(status_q, f"⚠️ Could not write parse cache: {e}")
+    return parsed_count, rejected, records
+
+def parse_full_xml(xml_path: Path, config: Dict[str,Any], debug_path: Path, status_q=None) -> Tuple[List[str], List[str], List[str]]:
     matched, skip_reasons = [], Counter()
+    rules = _build_filter_rules(config)
+    parsed_count, rejected, records = _load_machine_records(xml_path, status_q)
+    _status(status_q, f"XML loaded: {parsed_count} entries detected…")
+    if rejected: skip_reasons["not_arcade"] += rejected
     
-    for m in entries:
-        clone_score, is_unwanted_type = _clone_status(m)
-        if clone_score == 1 and not config.get("include_clones"): skip_reasons["clone_type"]+=1; continue
-        if clone_score == 2 and not config.get("include_bootlegs"): skip_reasons["clone_type"]+=1; continue
-        if clone_score == 3 and not config.get("include_prototypes"): skip_reasons["clone_type"]+=1; continue
-        
-        if not is_actually_an_arcade_machine(m): skip_reasons["not_arcade"] += 1; continue
-        if config.get("working_only", False) and not _good_driver_status(m.find("driver")): skip_reasons["not_working"] += 1; continue
-        if not _mature_ok(config.get("mature", False), m): skip_reasons["mature"] += 1; continue
-        if not _match_orientation(m.find("display"), config.get("orientation","both")): skip_reasons["orientation"] += 1; continue
-        if not _players_ok(config.get("players", 99), m): skip_reasons["players"] += 1; continue
-        if not _buttons_ok(config.get("max_buttons", 99), m): skip_reasons["buttons"] += 1; continue
-        if not _controls_ok(config.get("controls", []), m): skip_reasons["controls"] += 1; continue
-        if not _directions_ok(config.get("directions", []), m): skip_reasons["directions"] += 1; continue
-        
-        name = m.get("name") or ""
-        description = m.findtext("description", "")
-        region_score_val = _region_score(name, description, config.get("region_order", []))
-        language_score = 0
-        if config.get("language_order"):
-            langs = config["language_order"]
-            text = f"{name} {description}".lower()
-            for idx, l in enumerate(langs):
-                if l in text:
-                    language_score = idx; break
-            else:
-                language_score = len(langs) + 1
+    for rec in records:
+        reason, clone_score, region_score_val, language_score = _filter_one(rec, rules)
+        if reason: skip_reasons[reason] += 1; continue
         
-        chds = [disk.get("name") for disk in m.findall("disk")]
-        samples = [s.get("name") for s in m.findall("sample")]
-        if m.get("sampleof"): samples.append(m.get("sampleof"))
-        
-        bios = m.get("romof")
-        
-        matched.append({
-            "name": name, "description": description, "clone_score": clone_score,
-            "region_score": region_score_val, "language_score": language_score,
-            "chds": chds, "samples": list(set(samples)), "bios": bios
-        })
-
-    _status(status_q, f"Matched {len(matched)} / {len(entries)} after filtering.")
-    matched.sort(key=lambda r: (r["clone_score"], r["region_score"], r["language_score"], r["name"]))
+        matched.append(MatchedMachine(clone_score, region_score_val, language_score, rec.name, rec.description,
+                                      rec.bios, rec.chds, rec.samples))
+
+    _status(status_q, f"Matched {len(matched)} / {parsed_count} after filtering.")
+    matched.sort(key=operator.itemgetter(0, 1, 2, 3))
     
-    deduped, seen_games = [], set()
-    final_roms_to_copy, final_chds_to_copy, final_samples_to_copy = set(), set(), set()
-    final_log_entries = []
-
-    for r in matched:
-        if r["name"] not in seen_games:
-            seen_games.add(r["name"])
-            final_log_entries.append(r)
-            
-            final_roms_to_copy.add(r["name"])
-            if r.get("bios"): final_roms_to_copy.add(r["bios"])
-            for chd in r.get("chds", []): final_chds_to_copy.add(f"{r['name']}/{chd}.chd")
-            for sample in r.get("samples", []): final_samples_to_copy.add(sample)
+    # Dicts double as insertion-ordered sets, so every output list comes out best-first.
+    kept = {}
+    for r in matched: kept.setdefault(r.name, r)
+    final_log_entries = list(kept.values())
+    
+    final_roms_to_copy, final_chds_to_copy, final_samples_to_copy = {}, {}, {}
+    for r in final_log_entries:
+        final_roms_to_copy[r.name] = None
+        if r.bios: final_roms_to_copy[r.bios] = None
+        for chd in r.chds: final_chds_to_copy[f"{r.name}/{chd}.chd"] = None
+        final_samples_to_copy.update(dict.fromkeys(r.samples))
 
     _status(status_q, f"After dedupe: {len(final_log_entries)} unique titles ready to copy.")
+    lines = [f"Total parsed: {parsed_count}\nMatched unique: {len(final_log_entries)}\n"]
+    lines.extend(f"Skipped {k}: {v}\n" for k,v in sorted(skip_reasons.items()))
+    lines.append("\nKept list (best-first):\n")
+    lines.extend(f"{i:4d}. {r.name} — {r.description}\n" for i, r in enumerate(final_log_entries, 1))
     with open(debug_path, "w", encoding="utf-8") as dbg:
-        dbg.write(f"Total parsed: {len(entries)}\nMatched unique: {len(final_log_entries)}\n")
-        for k,v in sorted(skip_reasons.items()): dbg.write(f"Skipped {k}: {v}\n")
-        dbg.write("\nKept list (best-first):\n")
-        for i, r in enumerate(final_log_entries, 1): dbg.write(f"{i:4d}. {r['name']} — {r['description']}\n")
+        dbg.write("".join(lines))
     
     return list(final_roms_to_copy), list(final_chds_to_copy), list(final_samples_to_copy)
 
+def _index_archives(folder: Path, extensions: Tuple[str, ...]) -> Dict[str, Path]:
+    """Maps archive stems in `folder` to their paths with a single directory scan.
+
+    When a stem exists with several extensions, the one listed first wins. Names are
+    compared with os.path.normcase so lookups stay case-insensitive on Windows.
+    """
+    found = {}
+    try:
+        with os.scandir(folder) as it:
+            for entry in it:
+                stem, dot, ext = os.path.normcase(entry.name).rpartition(".")
+                if not dot or ext not in extensions or not entry.is_file(): continue
+                rank = extensions.index(ext)
+                if stem not in found or rank < found[stem][0]:
+                    found[stem] = (rank, Path(entry.path))
+    except OSError:
+        return {}
+    return {stem: path for stem, (_, path) in found.items()}
+
+def _fast_copy(source: Path, dest: Path) -> None:
+    """Copies data and metadata like shutil.copy2, without a userspace buffer where possible."""
+    if _CopyFileExW is None:
+        shutil.copy2(source, dest)
+        return
+    if not _CopyFileExW(str(source), str(dest), None, None, None, 0):
+        raise ctypes.WinError(ctypes.get_last_error())
+    shutil.copystat(source, dest)
+
 def copy_assets(rom_list: List[str], chd_list: List[str], sample_list: List[str],
                 rom_dir: Path, sample_dir: Optional[Path],
-                out_rom_dir: Path, out_sample_dir: Path, status_q=None):
+                out_rom_dir: Path, out_sample_dir: Path, status_q=None,
+                max_workers: int = COPY_WORKERS):
     
     total_assets = len(rom_list) + len(chd_list) + len(sample_list)
     copied_count = 0
+    jobs = []  # (asset kind, source, destination)
     
-    # 1. Copy ROMs (zips and 7z)
+    # 1. ROMs (zips and 7z)
+    rom_index = _index_archives(rom_dir, ("zip", "7z"))
     for name in rom_list:
-        source_zip = rom_dir / f"{name}.zip"
-        source_7z = rom_dir / f"{name}.7z"
-        source_file = None
-        if source_zip.exists(): source_file = source_zip
-        elif source_7z.exists(): source_file = source_7z
+        source_file = rom_index.get(os.path.normcase(name))
+        if source_file: jobs.append(("ROM", source_file, out_rom_dir / source_file.name))
         
-        if source_file:
-            try:
-                shutil.copy2(source_file, out_rom_dir / source_file.name)
-                copied_count += 1
-            except Exception as e:
-                _status(status_q, f"⚠️ ROM copy failed: {e}")
-        
-    # 2. Copy CHDs
+    # 2. CHDs — per-game folders are created here, before any copy is in flight.
     for chd_path_str in chd_list:
         source_chd = rom_dir / chd_path_str
         if source_chd.exists():
             dest_folder = out_rom_dir / source_chd.parent.name
             dest_folder.mkdir(exist_ok=True)
-            try:
-                shutil.copy2(source_chd, dest_folder / source_chd.name)
-                copied_count += 1
-            except Exception as e:
-                _status(status_q, f"⚠️ CHD copy failed: {e}")
+            jobs.append(("CHD", source_chd, dest_folder / source_chd.name))
 
-    # 3. Copy Samples
+    # 3. Samples
     if sample_dir and sample_dir.is_dir():
+        sample_index = _index_archives(sample_dir, ("zip",))
         for sample_name in sample_list:
-            source_sample = sample_dir / f"{sample_name}.zip"
-            if source_sample.exists():
-                try:
-                    shutil.copy2(source_sample, out_sample_dir / source_sample.name)
-                    copied_count += 1
-                except Exception as e:
-                    _status(status_q, f"⚠️ Sample copy failed: {e}")
+            source_sample = sample_index.get(os.path.normcase(sample_name))
+            if source_sample: jobs.append(("Sample", source_sample, out_sample_dir / source_sample.name))
+
+    completed = 0
+    progress = BatchedStatus(status_q)
+    progress_every = max(1, len(jobs) // COPY_PROGRESS_STEPS)
+    def _finish(future, kind) -> int:
+        nonlocal completed
+        completed += 1
+        try:
+            future.result()
+            return 1
+        except Exception as e:
+            _status(progress, f"⚠️ {kind} copy failed: {e}")
+            return 0
+        finally:
+            if completed % progress_every == 0 or completed == len(jobs):
+                progress.update(f"📦 Copy progress: {completed} / {len(jobs)} files…")
+
+    with ThreadPoolExecutor(max_workers=max(1, int(max_workers))) as pool:
+        inflight = {}
+        for kind, source, dest in jobs:
+            if len(inflight) >= COPY_MAX_INFLIGHT:
+                done, _ = wait(inflight, return_when=FIRST_COMPLETED)
+                for future in done: copied_count += _finish(future, inflight.pop(future))
+            inflight[pool.submit(_fast_copy, source, dest)] = kind
+        for future in wait(inflight).done: copied_count += _finish(future, inflight[future])
+    progress.flush()
     
     _status(status_q, f"✅ Copy complete. {copied_count} asset files copied.")
 
@@ -460,44 +735,51 @@ def run_sort(config: Dict[str,Any], status_q: Optional[queue.Queue]=None) -> Non
     total_assets = len(roms_to_copy) + len(chds_to_copy) + len(samples_to_copy)
     _status(status_q, f"📁 Found {total_assets} total assets to copy to: {out_base_dir}")
     
-    copy_assets(roms_to_copy, chds_to_copy, samples_to_copy, rom_dir, sample_dir, out_rom_dir, out_sample_dir, status_q)
+    copy_assets(roms_to_copy, chds_to_copy, samples_to_copy, rom_dir, sample_dir, out_rom_dir, out_sample_dir, status_q,
+                max_workers=config.get("copy_workers") or COPY_WORKERS)
     _status(status_q, f"📄 Debug log written to: {debug_path}")
 
+def _run_sort_process(config: Dict[str,Any], status_q) -> None:
+    """Child-process entry point for the GUI: runs the sort and reports how it ended on `status_q`."""
+    try: run_sort(config, status_q=status_q); status_q.put(("done","✅ Finished successfully."))
+    except Exception as e: status_q.put(("error", f"❌ Error: {e}"))
+
 # -------------------------------
 # Preset utilities
 # -------------------------------
-def save_preset(path: Path, config: Dict[str,Any]):
-    with open(path, "w", encoding="utf-8") as f: json.dump(config, f, indent=2)
+def save_preset(path: Union[str, os.PathLike], config: Dict[str,Any]):
+    if ORJSON_AVAILABLE: data = orjson.dumps(config, option=orjson.OPT_INDENT_2)
+    else: data = json.dumps(config, indent=2).encode("utf-8")
+    with open(path, "wb") as f: f.write(data)
 
-def load_preset(path: Path) -> Dict[str,Any]:
-    with open(path, "r", encoding="utf-8") as f: return json.load(f)
+def load_preset(path: Union[str, os.PathLike]) -> Dict[str,Any]:
+    # Both parsers take the raw bytes, so the file is read once with no text decoding layer.
+    with open(path, "rb") as f: data = f.read()
+    return orjson.loads(data) if ORJSON_AVAILABLE else json.loads(data)
 
 # -------------------------------
 # GUI: XML Scanner
 # -------------------------------
+KNOWN_REGIONS = frozenset({
+    'argentina', 'asia', 'australia', 'austria', 'belgium', 'brazil', 'canada',
+    'china', 'denmark', 'europe', 'euro', 'finland', 'france', 'germany',
+    'greece', 'hispanic', 'hong kong', 'ireland', 'italy', 'japan', 'korea',
+    'netherlands', 'new zealand', 'norway', 'poland', 'portugal', 'russia',
+    'scandinavia', 'singapore', 'spain', 'sweden', 'switzerland', 'taiwan',
+    'uk', 'usa', 'us', 'world', 'w', 'j', 'u', 'e', 'a'
+})
+_PAREN_RE = re.compile(r'\(([^)]*)\)')
+
 def scan_xml_for_locales(xml_path: Path) -> Tuple[List[str], List[str]]:
-    KNOWN_REGIONS = {
-        'argentina', 'asia', 'australia', 'austria', 'belgium', 'brazil', 'canada',
-        'china', 'denmark', 'europe', 'euro', 'finland', 'france', 'germany',
-        'greece', 'hispanic', 'hong kong', 'ireland', 'italy', 'japan', 'korea',
-        'netherlands', 'new zealand', 'norway', 'poland', 'portugal', 'russia',
-        'scandinavia', 'singapore', 'spain', 'sweden', 'switzerland', 'taiwan',
-        'uk', 'usa', 'us', 'world', 'w', 'j', 'u', 'e', 'a'
-    }
     regions, languages = set(), set()
     try:
-        tree = ET.parse(xml_path)
-        root = tree.getroot()
-        entries = list(root.findall("machine")) or list(root.findall("game"))
-        
-        for m in entries:
-            desc = m.findtext("description", "")
-            if '(' not in desc and ')' not in desc: continue
-
-            tags_in_desc = re.findall(r'\((.*?)\)', desc)
-            for tag_group in tags_in_desc:
-                parts = [p.strip().lower() for p in tag_group.split(',')]
-                for part in parts:
+        for m in _iter_machines(xml_path):
+            desc = m.findtext("description", "") or ""
+            if '(' not in desc: continue
+
+            for tag_group in _PAREN_RE.findall(desc):
+                for part in tag_group.split(','):
+                    part = part.strip().lower()
                     if not part: continue
                     if part in KNOWN_LANGUAGES: languages.add(part)
                     elif part in KNOWN_REGIONS: regions.add(part)
@@ -505,9 +787,42 @@ def scan_xml_for_locales(xml_path: Path) -> Tuple[List[str], List[str]]:
         return [], []
     return sorted(list(regions)), sorted(list(languages))
 
+def _locale_cache_key(xml_path: Path) -> List[Any]:
+    st = xml_path.stat()
+    return [str(xml_path.resolve()), st.st_size, st.st_mtime_ns]
+
+def load_cached_locales(xml_path: Path) -> Optional[Tuple[List[str], List[str]]]:
+    """Returns the (regions, languages) from a previous scan of this exact full.xml, or None."""
+    try:
+        with open(_cache_file("locales", xml_path, ".json"), "rb") as f: data = json.loads(f.read())
+        if data.get("key") != _locale_cache_key(xml_path): return None
+        regions, languages = data["regions"], data["languages"]
+        if all(isinstance(v, str) for v in regions + languages): return regions, languages
+    except Exception:
+        pass
+    return None
+
+def save_cached_locales(xml_path: Path, result: Tuple[List[str], List[str]]):
+    cache_path = _cache_file("locales", xml_path, ".json")
+    tmp_path = cache_path.with_name(cache_path.name + ".tmp")
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"key": _locale_cache_key(xml_path), "regions": list(result[0]), "languages": list(result[1])}
+        with open(tmp_path, "w", encoding="utf-8") as f: f.write(json.dumps(data))
+        os.replace(tmp_path, cache_path)
+    except OSError:
+        pass
+
 # -------------------------------
 # GUI layer (Tkinter)
 # -------------------------------
+LOG_MAX_LINES = 5000  # older rows are trimmed so a long run doesn't bloat the log Listbox
+QUEUE_BATCH = 256     # max status_q items handled per tick, bounding the UI stall
+QUEUE_POLL_BUSY_MS, QUEUE_POLL_IDLE_MS = 50, 400
+# Worker processes are always spawned, never forked: the GUI process has live threads, and
+# spawn is already what Windows and PyInstaller builds use.
+MP_CONTEXT = multiprocessing.get_context("spawn")
+
 class ScrollableFrame(ttk.Frame):
     def __init__(self, container, *args, **kwargs):
         super().__init__(container, *args, **kwargs)
@@ -536,11 +851,16 @@ class SorterApp:
         self.root.minsize(800, 700)
         
         self.status_q = queue.Queue()
-        self.worker_thread = None
+        self._log_buffer = deque()
+        self.worker_thread = None  # relays the sort process's messages onto status_q
+        self.worker_proc = None
         self.player_values = [str(i) for i in range(1,17)] + ["All"]
         self.control_values = ["joystick","trackball","spinner","dial","paddle","lightgun","positional","mouse","pedal","stick (analog)","keyboard","buttons only","other","all"]
         self.direction_values = ["4-way","8-way","2-way horizontal","2-way vertical","49-way","rotary","analog","All"]
         self.script_dir = get_base_path()
+        self._last_dirs = {}  # browse field -> folder its dialog should open in next time
+        # Locale scans are CPU-bound XML parsing; a child process keeps the GIL free for Tk.
+        self.scan_pool = self._create_scan_pool()
 
         self._create_widgets()
         self.process_queue()
@@ -582,21 +902,77 @@ class SorterApp:
         splash.geometry(f"+{x}+{y}")
         splash.protocol("WM_DELETE_WINDOW", self.root.destroy)
 
+    def _create_vars(self):
+        """Creates every Tk variable up front so presets and build_config work before lazy pages exist."""
+        self.roms_var = tk.StringVar(value=str(self.script_dir))
+        self.samples_var = tk.StringVar(value=str(self.script_dir / "samples"))
+        self.xml_var = tk.StringVar(value=str(self.script_dir / "full.xml"))
+        self.out_var = tk.StringVar(value="filtered_mame_set")
+        self.players_var = tk.StringVar(value="2")
+        self.buttons_var = tk.StringVar(value="6")
+        self.control_vars, self._controls_on = {v: tk.BooleanVar() for v in self.control_values}, set()
+        self.dir_vars, self._dirs_on = {v: tk.BooleanVar() for v in self.direction_values}, set()
+        self.clones_var = tk.BooleanVar(value=False)
+        self.bootlegs_var = tk.BooleanVar(value=False)
+        self.prototypes_var = tk.BooleanVar(value=False)
+        self.orientation_var = tk.StringVar(value="horizontal")
+        self.working_var = tk.BooleanVar(value=True)
+        self.mature_var = tk.BooleanVar(value=False)
+        # Mirrors of the preferred listboxes, kept in sync by every edit so build_config needs no Tk reads.
+        self._region_pref: List[str] = []
+        self._lang_pref: List[str] = []
+
     def _create_widgets(self):
+        self._create_vars()
+        # One shared style for the control/direction grids, configured once rather than per widget.
+        ttk.Style(self.root).configure("App.TCheckbutton", padding=(2, 1))
         self.root.grid_rowconfigure(0, weight=1); self.root.grid_columnconfigure(0, weight=1)
         paned_window = ttk.PanedWindow(self.root, orient=tk.VERTICAL)
         paned_window.grid(row=0, column=0, sticky="nsew", padx=10, pady=10)
         scrollable_outer_frame = ScrollableFrame(paned_window)
         main_frame = scrollable_outer_frame.scrollable_frame
+
+        # Controls and Filters are only built when their tab is first opened. Locale
+        # Preferences is built now because the startup scan fills its listboxes.
+        self.notebook = ttk.Notebook(main_frame)
+        self.notebook.pack(fill=tk.X, expand=True, pady=5, padx=10)
+        self._builders = {}
+        for title, builder, lazy in (("Paths", self._build_paths_page, False), ("Controls", self._build_controls_page, True),
+                                     ("Filters", self._build_filters_page, True), ("Locale Preferences", self._build_locale_page, False)):
+            page = ttk.Frame(self.notebook, padding="10")
+            self.notebook.add(page, text=title)
+            if lazy: self._builders[str(page)] = (builder, page)
+            else: builder(page)
+        self.notebook.bind("<<NotebookTabChanged>>", self._on_tab_changed)
+
+        ttk.Separator(main_frame).pack(fill=tk.X, pady=10)
+        button_bar = ttk.Frame(main_frame)
+        button_bar.pack(fill=tk.X, expand=True, padx=10, pady=(0,10))
+        self.run_button = ttk.Button(button_bar, text="Run", command=self.start_sort)
+        self.run_button.pack(side=tk.LEFT, padx=(0,5))
+        ttk.Button(button_bar, text="Save Preset", command=self.save_preset_gui).pack(side=tk.LEFT, padx=5)
+        ttk.Button(button_bar, text="Load Preset", command=self.load_preset_gui).pack(side=tk.LEFT, padx=5)
         
-        paths_frame = ttk.LabelFrame(main_frame, text="Paths", padding="10")
-        paths_frame.pack(fill=tk.X, expand=True, pady=5, padx=10)
-        paths_frame.columnconfigure(1, weight=1)
-        self.roms_var = tk.StringVar(value=str(self.script_dir))
-        self.samples_var = tk.StringVar(value=str(self.script_dir / "samples"))
-        self.xml_var = tk.StringVar(value=str(self.script_dir / "full.xml"))
-        self.out_var = tk.StringVar(value="filtered_mame_set")
+        log_frame = ttk.Frame(paned_window)
+        log_frame.grid_rowconfigure(0, weight=1); log_frame.grid_columnconfigure(0, weight=1)
+        # An append-only Listbox: inserts are far cheaper than Text's line bookkeeping.
+        self.log_text = tk.Listbox(log_frame, height=8, activestyle="none")
+        self.log_text.grid(row=0, column=0, sticky="nsew")
+        log_scrollbar = ttk.Scrollbar(log_frame, orient="vertical", command=self.log_text.yview)
+        log_scrollbar.grid(row=0, column=1, sticky="ns")
+        log_xscrollbar = ttk.Scrollbar(log_frame, orient="horizontal", command=self.log_text.xview)
+        log_xscrollbar.grid(row=1, column=0, sticky="ew")
+        self.log_text.config(yscrollcommand=log_scrollbar.set, xscrollcommand=log_xscrollbar.set)
         
+        paned_window.add(scrollable_outer_frame, weight=4)
+        paned_window.add(log_frame, weight=1)
+
+    def _on_tab_changed(self, event):
+        entry = self._builders.pop(self.notebook.select(), None)
+        if entry: builder, page = entry; builder(page)
+
+    def _build_paths_page(self, paths_frame):
+        paths_frame.columnconfigure(1, weight=1)
         ttk.Label(paths_frame, text="MAME ROMs Path:").grid(row=0, column=0, sticky=tk.W, pady=2)
         ttk.Entry(paths_frame, textvariable=self.roms_var).grid(row=0, column=1, sticky=tk.EW)
         ttk.Button(paths_frame, text="Browse...", command=self.browse_roms).grid(row=0, column=2, padx=5)
@@ -612,12 +988,9 @@ class SorterApp:
         ttk.Label(paths_frame, text="Main Output Folder:").grid(row=3, column=0, sticky=tk.W, pady=2)
         ttk.Entry(paths_frame, textvariable=self.out_var).grid(row=3, column=1, sticky=tk.EW, columnspan=2)
 
-        controls_frame = ttk.LabelFrame(main_frame, text="Controls", padding="10")
-        controls_frame.pack(fill=tk.X, expand=True, pady=5, padx=10)
+    def _build_controls_page(self, controls_frame):
         p_b_frame = ttk.Frame(controls_frame)
         p_b_frame.pack(fill=tk.X, expand=True, pady=5)
-        self.players_var = tk.StringVar(value="2")
-        self.buttons_var = tk.StringVar(value="6")
         ttk.Label(p_b_frame, text="Max Players:").pack(side=tk.LEFT, padx=(0,5))
         ttk.Combobox(p_b_frame, textvariable=self.players_var, values=self.player_values, state="readonly", width=5).pack(side=tk.LEFT)
         ttk.Label(p_b_frame, text="Max Buttons:").pack(side=tk.LEFT, padx=(20,5))
@@ -627,63 +1000,35 @@ class SorterApp:
         check_outer_frame.columnconfigure(0, weight=1); check_outer_frame.columnconfigure(1, weight=1)
         controls_check_frame = ttk.LabelFrame(check_outer_frame, text="Control Types", padding=5)
         controls_check_frame.grid(row=0, column=0, sticky=tk.NSEW, padx=(0,5))
-        self.control_vars = {}
-        for i, val in enumerate(self.control_values):
-            self.control_vars[val] = tk.BooleanVar()
-            ttk.Checkbutton(controls_check_frame, text=val, variable=self.control_vars[val]).grid(row=i % 7, column=i // 7, sticky=tk.W)
+        track, controls_on, dirs_on = self._track_check, self._controls_on, self._dirs_on
+        for i, (val, var) in enumerate(self.control_vars.items()):
+            ttk.Checkbutton(controls_check_frame, text=val, variable=var, style="App.TCheckbutton",
+                            command=lambda v=val, var=var: track(controls_on, var, v)).grid(row=i % 7, column=i // 7, sticky=tk.W)
         dirs_check_frame = ttk.LabelFrame(check_outer_frame, text="Joystick Directions", padding=5)
         dirs_check_frame.grid(row=0, column=1, sticky=tk.NSEW, padx=(5,0))
-        self.dir_vars = {}
-        for i, val in enumerate(self.direction_values):
-            self.dir_vars[val] = tk.BooleanVar()
-            ttk.Checkbutton(dirs_check_frame, text=val, variable=self.dir_vars[val]).grid(row=i, column=0, sticky=tk.W)
+        for i, (val, var) in enumerate(self.dir_vars.items()):
+            ttk.Checkbutton(dirs_check_frame, text=val, variable=var, style="App.TCheckbutton",
+                            command=lambda v=val, var=var: track(dirs_on, var, v)).grid(row=i, column=0, sticky=tk.W)
 
-        filters_frame = ttk.LabelFrame(main_frame, text="Filters", padding="10")
-        filters_frame.pack(fill=tk.X, expand=True, pady=5, padx=10)
+    def _build_filters_page(self, filters_frame):
         game_types_frame = ttk.LabelFrame(filters_frame, text="Game Types to Include", padding=5)
         game_types_frame.pack(side=tk.RIGHT, padx=(10,0), fill=tk.Y)
-        self.clones_var = tk.BooleanVar(value=False)
-        self.bootlegs_var = tk.BooleanVar(value=False)
-        self.prototypes_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(game_types_frame, text="Official Clones", variable=self.clones_var).pack(anchor=tk.W)
         ttk.Checkbutton(game_types_frame, text="Bootlegs & Hacks", variable=self.bootlegs_var).pack(anchor=tk.W)
         ttk.Checkbutton(game_types_frame, text="Prototypes & Demos", variable=self.prototypes_var).pack(anchor=tk.W)
         other_filters_frame = ttk.Frame(filters_frame)
         other_filters_frame.pack(side=tk.LEFT, fill=tk.Y)
-        self.orientation_var = tk.StringVar(value="horizontal")
         ttk.Radiobutton(other_filters_frame, text="Horizontal", variable=self.orientation_var, value="horizontal").pack(anchor=tk.W)
         ttk.Radiobutton(other_filters_frame, text="Vertical", variable=self.orientation_var, value="vertical").pack(anchor=tk.W)
         ttk.Radiobutton(other_filters_frame, text="Both", variable=self.orientation_var, value="both").pack(anchor=tk.W)
-        self.working_var = tk.BooleanVar(value=True)
-        self.mature_var = tk.BooleanVar(value=False)
         ttk.Checkbutton(other_filters_frame, text="Only Working", variable=self.working_var).pack(anchor=tk.W, pady=(10,0))
         ttk.Checkbutton(other_filters_frame, text="Include Mature", variable=self.mature_var).pack(anchor=tk.W)
-        
-        locale_frame = ttk.LabelFrame(main_frame, text="Locale Preferences", padding="10")
-        locale_frame.pack(fill=tk.X, expand=True, pady=5, padx=10)
-        self.region_list_avail, self.region_list_pref = self._create_dual_listbox(locale_frame, "Regions")
-        self.lang_list_avail, self.lang_list_pref = self._create_dual_listbox(locale_frame, "Languages")
 
-        ttk.Separator(main_frame).pack(fill=tk.X, pady=10)
-        button_bar = ttk.Frame(main_frame)
-        button_bar.pack(fill=tk.X, expand=True, padx=10, pady=(0,10))
-        self.run_button = ttk.Button(button_bar, text="Run", command=self.start_sort)
-        self.run_button.pack(side=tk.LEFT, padx=(0,5))
-        ttk.Button(button_bar, text="Save Preset", command=self.save_preset_gui).pack(side=tk.LEFT, padx=5)
-        ttk.Button(button_bar, text="Load Preset", command=self.load_preset_gui).pack(side=tk.LEFT, padx=5)
-        
-        log_frame = ttk.Frame(paned_window)
-        log_frame.grid_rowconfigure(0, weight=1); log_frame.grid_columnconfigure(0, weight=1)
-        self.log_text = tk.Text(log_frame, height=8, state=tk.DISABLED, wrap=tk.WORD)
-        self.log_text.grid(row=0, column=0, sticky="nsew")
-        log_scrollbar = ttk.Scrollbar(log_frame, orient="vertical", command=self.log_text.yview)
-        log_scrollbar.grid(row=0, column=1, sticky="ns")
-        self.log_text.config(yscrollcommand=log_scrollbar.set)
-        
-        paned_window.add(scrollable_outer_frame, weight=4)
-        paned_window.add(log_frame, weight=1)
+    def _build_locale_page(self, locale_frame):
+        self.region_list_avail, self.region_list_pref = self._create_dual_listbox(locale_frame, "Regions", self._region_pref)
+        self.lang_list_avail, self.lang_list_pref = self._create_dual_listbox(locale_frame, "Languages", self._lang_pref)
 
-    def _create_dual_listbox(self, parent, title: str):
+    def _create_dual_listbox(self, parent, title: str, pref: List[str]):
         frame = ttk.Frame(parent)
         frame.pack(fill=tk.X, expand=True, pady=5)
         frame.columnconfigure(0, weight=1); frame.columnconfigure(2, weight=1)
@@ -699,68 +1044,109 @@ class SorterApp:
             selection = src.curselection()
             if not selection: return
             for i in selection[::-1]:
-                dst.insert(tk.END, src.get(i))
+                item = src.get(i)
+                dst.insert(tk.END, item)
                 src.delete(i)
+                if dst is list_pref: pref.append(item)
+                else: del pref[i]
         def move_up(lst):
             selection = lst.curselection()
             if not selection: return
             for i in selection:
-                if i > 0: lst.insert(i - 1, lst.get(i)); lst.delete(i+1); lst.selection_set(i - 1)
+                if i > 0:
+                    lst.insert(i - 1, lst.get(i)); lst.delete(i+1); lst.selection_set(i - 1)
+                    pref[i - 1], pref[i] = pref[i], pref[i - 1]
         def move_down(lst):
             selection = lst.curselection()
             if not selection: return
             for i in selection[::-1]:
-                if i < lst.size() - 1: lst.insert(i + 2, lst.get(i)); lst.delete(i); lst.selection_set(i + 1)
+                if i < lst.size() - 1:
+                    lst.insert(i + 2, lst.get(i)); lst.delete(i); lst.selection_set(i + 1)
+                    pref[i], pref[i + 1] = pref[i + 1], pref[i]
         ttk.Button(btn_frame, text=">>", command=lambda: move_items(list_avail, list_pref)).pack(pady=2)
         ttk.Button(btn_frame, text="<<", command=lambda: move_items(list_pref, list_avail)).pack(pady=2)
         ttk.Button(btn_frame, text="▲", command=lambda: move_up(list_pref)).pack(pady=2)
         ttk.Button(btn_frame, text="▼", command=lambda: move_down(list_pref)).pack(pady=2)
         return list_avail, list_pref
 
+    def _track_check(self, selected: Set[str], var, val: str):
+        """Checkbutton command: mirrors its state into a Python set so build_config needs no Tk reads."""
+        if var.get(): selected.add(val)
+        else: selected.discard(val)
+
     def browse_roms(self):
-        dir = filedialog.askdirectory(initialdir=self.script_dir, title="Select MAME ROMs Folder")
-        if dir: self.roms_var.set(dir)
+        dir = filedialog.askdirectory(initialdir=self._last_dirs.get("rom", self.script_dir), title="Select MAME ROMs Folder")
+        if dir: self.roms_var.set(dir); self._last_dirs["rom"] = str(Path(dir).parent)
     
     def browse_samples(self):
-        dir = filedialog.askdirectory(initialdir=self.script_dir, title="Select MAME Samples Folder")
-        if dir: self.samples_var.set(dir)
+        dir = filedialog.askdirectory(initialdir=self._last_dirs.get("sample", self.script_dir), title="Select MAME Samples Folder")
+        if dir: self.samples_var.set(dir); self._last_dirs["sample"] = str(Path(dir).parent)
 
     def browse_xml(self):
-        file = filedialog.askopenfilename(initialdir=self.script_dir, title="Select full.xml", filetypes=(("XML files", "*.xml"),("All files", "*.*")))
-        if file: self.xml_var.set(file); self.start_xml_scan()
+        file = filedialog.askopenfilename(initialdir=self._last_dirs.get("xml", self.script_dir), title="Select full.xml", filetypes=(("XML files", "*.xml"),("All files", "*.*")))
+        if file: self.xml_var.set(file); self._last_dirs["xml"] = str(Path(file).parent); self.start_xml_scan()
 
     def log(self, msg):
-        self.log_text.config(state=tk.NORMAL)
-        self.log_text.insert(tk.END, msg + "\n")
+        # Buffered; process_queue writes the batch to the widget on its next tick.
+        self._log_buffer.append(msg)
+
+    def _flush_log(self):
+        if not self._log_buffer: return
+        rows = "\n".join(self._log_buffer).split("\n")  # one row per line; a Listbox can't wrap
+        self._log_buffer.clear()
+        self.log_text.insert(tk.END, *rows)
+        excess = self.log_text.size() - LOG_MAX_LINES
+        if excess > 0: self.log_text.delete(0, excess - 1)
         self.log_text.see(tk.END)
-        self.log_text.config(state=tk.DISABLED)
 
     def start_xml_scan(self):
         xml_path_str = self.xml_var.get()
         if not xml_path_str: self.log("⚠️ full.xml path is empty."); return
         xml_path = Path(xml_path_str)
         if not xml_path.exists(): self.log(f"⚠️ full.xml not found at: {xml_path}"); return
+        cached = load_cached_locales(xml_path)
+        if cached is not None: self.status_q.put(("locales_done", cached)); return
         self.log(f"🔄 Scanning {xml_path.name} for locales...")
-        def worker():
-            regions, languages = scan_xml_for_locales(xml_path)
-            self.status_q.put(("locales_done", (regions, languages)))
-        threading.Thread(target=worker, daemon=True).start()
+        def on_done(future):
+            try: result = future.result()
+            except Exception as e: self.status_q.put(("status", f"⚠️ Locale scan failed: {e}")); return
+            # An empty result usually means the scan hit a parse error, so don't pin it in the cache.
+            if result[0] or result[1]: save_cached_locales(xml_path, result)
+            self.status_q.put(("locales_done", result))
+        try: future = self.scan_pool.submit(scan_xml_for_locales, xml_path)
+        except BrokenProcessPool:
+            # The last scan worker died abruptly (e.g. killed for memory), which leaves the pool unusable.
+            self.log("⚠️ Locale scan worker stopped unexpectedly — restarting it.")
+            self.scan_pool.shutdown(wait=False)
+            self.scan_pool = self._create_scan_pool()
+            future = self.scan_pool.submit(scan_xml_for_locales, xml_path)
+        future.add_done_callback(on_done)
+
+    def _create_scan_pool(self) -> ProcessPoolExecutor:
+        return ProcessPoolExecutor(max_workers=1, mp_context=MP_CONTEXT)
+
+    def _snapshot_tkvars(self) -> SimpleNamespace:
+        """Reads every Tk variable once, already stripped and converted to the config's types."""
+        p, b = self.players_var.get(), self.buttons_var.get()
+        return SimpleNamespace(
+            rom_dir=self.roms_var.get().strip(), sample_dir=self.samples_var.get().strip(),
+            full_xml=self.xml_var.get().strip(), output_path=(self.out_var.get() or "filtered_mame_set").strip(),
+            players=99 if p.lower()=="all" else int(p), max_buttons=99 if b.lower()=="all" else int(b),
+            orientation=self.orientation_var.get(), working_only=self.working_var.get(), mature=self.mature_var.get(),
+            include_clones=self.clones_var.get(), include_bootlegs=self.bootlegs_var.get(), include_prototypes=self.prototypes_var.get(),
+        )
 
     def build_config(self):
-        c = [val for val, var in self.control_vars.items() if var.get()]
-        d = [val for val, var in self.dir_vars.items() if var.get()]
-        p, b = self.players_var.get(), self.buttons_var.get()
+        snap = self._snapshot_tkvars()
+        c = [] if "all" in self._controls_on else [val for val in self.control_values if val in self._controls_on]
+        d = [] if "All" in self._dirs_on else [val for val in self.direction_values if val in self._dirs_on]
         return {
-            "rom_dir": self.roms_var.get().strip(), "sample_dir": self.samples_var.get().strip(),
-            "full_xml": self.xml_var.get().strip(), "output_path": (self.out_var.get() or "filtered_mame_set").strip(),
-            "players": 99 if str(p).lower()=="all" else int(p), "max_buttons": 99 if str(b).lower()=="all" else int(b),
-            "controls": [] if any(str(x).lower()=="all" for x in c) else c, "directions": [] if any(str(x).lower()=="all" for x in d) else d,
-            "orientation": self.orientation_var.get(), "working_only": self.working_var.get(), "mature": self.mature_var.get(), 
-            "include_clones": self.clones_var.get(), "include_bootlegs": self.bootlegs_var.get(), "include_prototypes": self.prototypes_var.get(),
-            "region_order": list(self.region_list_pref.get(0, tk.END)), "language_order": list(self.lang_list_pref.get(0, tk.END)),
+            **vars(snap), "controls": c, "directions": d,
+            "region_order": list(self._region_pref), "language_order": list(self._lang_pref),
         }
         
     def apply_config_to_gui(self, cfg):
+        old_xml = self.xml_var.get()
         self.roms_var.set(cfg.get("rom_dir", "")); self.samples_var.set(cfg.get("sample_dir", ""));
         self.xml_var.set(cfg.get("full_xml", "")); self.out_var.set(cfg.get("output_path", "filtered_mame_set"))
         p,b = cfg.get("players", 99), cfg.get("max_buttons", 99)
@@ -768,26 +1154,33 @@ class SorterApp:
         c, d = cfg.get("controls", []), cfg.get("directions", [])
         if not c: c = ["all"];
         if not d: d = ["All"]
-        for val, var in self.control_vars.items(): var.set(val in c)
-        for val, var in self.dir_vars.items(): var.set(val in d)
+        # Updated in place: the Checkbutton callbacks hold references to these sets.
+        self._controls_on.clear(); self._controls_on.update(v for v in self.control_values if v in c)
+        self._dirs_on.clear(); self._dirs_on.update(v for v in self.direction_values if v in d)
+        for val, var in self.control_vars.items(): var.set(val in self._controls_on)
+        for val, var in self.dir_vars.items(): var.set(val in self._dirs_on)
         self.orientation_var.set((cfg.get("orientation","horizontal") or "horizontal").lower())
         self.working_var.set(bool(cfg.get("working_only", True))); self.mature_var.set(bool(cfg.get("mature", False)))
         self.clones_var.set(bool(cfg.get("include_clones", False))); self.bootlegs_var.set(bool(cfg.get("include_bootlegs", False)))
         self.prototypes_var.set(bool(cfg.get("include_prototypes", False)))
-        self.start_xml_scan()
+        # Same full.xml as the lists already hold: reset them in place instead of re-scanning.
+        if old_xml == cfg.get("full_xml", "") and (self.region_list_avail.size() or self._region_pref):
+            self._reset_locale_list(self.region_list_avail, self.region_list_pref, self._region_pref)
+            self._reset_locale_list(self.lang_list_avail, self.lang_list_pref, self._lang_pref)
+        else: self.start_xml_scan()
         self.status_q.put(("apply_prefs", (cfg.get("region_order", []), cfg.get("language_order", []))))
 
     def save_preset_gui(self):
         cfg = self.build_config()
         file = filedialog.asksaveasfilename(defaultextension=".json", filetypes=[("JSON files", "*.json")], title="Save preset as…")
         if file:
-            try: save_preset(Path(file), cfg); self.log(f"💾 Preset saved: {file}")
+            try: save_preset(file, cfg); self.log(f"💾 Preset saved: {file}")
             except Exception as e: messagebox.showerror("Error", f"Failed to save preset:\n{e}")
 
     def load_preset_gui(self):
         file = filedialog.askopenfilename(filetypes=[("JSON files", "*.json")], title="Load preset…")
         if file:
-            try: cfg = load_preset(Path(file)); self.apply_config_to_gui(cfg); self.log(f"📂 Preset loaded: {file}")
+            try: cfg = load_preset(file); self.apply_config_to_gui(cfg); self.log(f"📂 Preset loaded: {file}")
             except Exception as e: messagebox.showerror("Error", f"Failed to load preset:\n{e}")
 
     def start_sort(self):
@@ -795,49 +1188,86 @@ class SorterApp:
         cfg = self.build_config()
         self.log("Starting…")
         self.run_button.config(state=tk.DISABLED)
-        def worker():
-            try: run_sort(cfg, status_q=self.status_q); self.status_q.put(("done","✅ Finished successfully."))
-            except Exception as e: self.status_q.put(("error", f"❌ Error: {e}"))
-        self.worker_thread = threading.Thread(target=worker, daemon=True); self.worker_thread.start()
+        # The sort runs in its own process so parsing and copying never hold the GUI's GIL.
+        mp_q = MP_CONTEXT.Queue()
+        self.worker_proc = MP_CONTEXT.Process(target=_run_sort_process, args=(cfg, mp_q), daemon=True)
+        self.worker_proc.start()
+        def relay(proc):
+            try:
+                while True:
+                    try: item = mp_q.get(timeout=0.5)
+                    except queue.Empty:
+                        if proc.is_alive(): continue
+                        try: item = mp_q.get(timeout=0.5)  # anything flushed just before the process exited
+                        except queue.Empty:
+                            self.status_q.put(("error", f"❌ Error: sort process exited unexpectedly (code {proc.exitcode}).")); return
+                    self.status_q.put(item)
+                    if item[0] in ("done", "error"): proc.join(); return
+            finally: mp_q.close()
+        self.worker_thread = threading.Thread(target=relay, args=(self.worker_proc,), daemon=True); self.worker_thread.start()
 
     def process_queue(self):
+        processed = False
+        q_get, log, after = self.status_q.get_nowait, self.log, self.root.after
         try:
-            while True:
-                kind, data = self.status_q.get_nowait()
-                if kind in ("status", "done", "error"): self.log(data)
+            for _ in range(QUEUE_BATCH):
+                kind, data = q_get()
+                processed = True
+                if kind in ("status", "done", "error"): log(data)
                 if kind in ("done", "error"): self.run_button.config(state=tk.NORMAL)
                 if kind == "locales_done":
                     regions, languages = data
-                    self.region_list_avail.delete(0, tk.END); self.lang_list_avail.delete(0, tk.END)
+                    region_avail, lang_avail = self.region_list_avail, self.lang_list_avail
+                    region_avail.delete(0, tk.END); lang_avail.delete(0, tk.END)
                     self.region_list_pref.delete(0, tk.END); self.lang_list_pref.delete(0, tk.END)
-                    for r in regions: self.region_list_avail.insert(tk.END, r)
-                    for l in languages: self.lang_list_avail.insert(tk.END, l)
-                    self.log(f"✅ Scan complete. Found {len(regions)} regions and {len(languages)} languages.")
+                    self._region_pref.clear(); self._lang_pref.clear()
+                    region_avail.insert(tk.END, *regions)
+                    lang_avail.insert(tk.END, *languages)
+                    log(f"✅ Scan complete. Found {len(regions)} regions and {len(languages)} languages.")
                 if kind == "apply_prefs":
-                    self.root.after(500, lambda: self._apply_prefs_to_listboxes(data[0], data[1]))
-                self.status_q.task_done()
+                    after(500, self._apply_prefs_to_listboxes, *data)
         except queue.Empty: pass
-        self.root.after(200, self.process_queue)
+        self._flush_log()
+        after(QUEUE_POLL_BUSY_MS if processed else QUEUE_POLL_IDLE_MS, self.process_queue)
         
     def _apply_prefs_to_listboxes(self, pref_regions, pref_langs):
-        avail_regions = list(self.region_list_avail.get(0, tk.END))
-        for item in pref_regions:
-            if item in avail_regions:
-                idx = avail_regions.index(item)
-                self.region_list_pref.insert(tk.END, self.region_list_avail.get(idx))
-                self.region_list_avail.delete(idx); avail_regions.pop(idx)
-        avail_langs = list(self.lang_list_avail.get(0, tk.END))
-        for item in pref_langs:
-            if item in avail_langs:
-                idx = avail_langs.index(item)
-                self.lang_list_pref.insert(tk.END, self.lang_list_avail.get(idx))
-                self.lang_list_avail.delete(idx); avail_langs.pop(idx)
+        self._move_prefs(self.region_list_avail, self.region_list_pref, self._region_pref, pref_regions)
+        self._move_prefs(self.lang_list_avail, self.lang_list_pref, self._lang_pref, pref_langs)
+
+    def _reset_locale_list(self, list_avail, list_pref, pref: List[str]):
+        """Moves every preferred item back to the available list, in scan (sorted) order."""
+        if not pref: return
+        items = sorted(list_avail.get(0, tk.END) + tuple(pref))
+        list_avail.delete(0, tk.END); list_pref.delete(0, tk.END); pref.clear()
+        list_avail.insert(tk.END, *items)
+
+    def _move_prefs(self, list_avail, list_pref, pref: List[str], prefs):
+        """Moves `prefs` (in order) from the available list to the preferred list.
+
+        Works on a Python snapshot and rebuilds the available list once, rather than
+        a get/delete round-trip to Tk for every preferred item.
+        """
+        avail = list(list_avail.get(0, tk.END))
+        pos = {v: i for i, v in reversed(list(enumerate(avail)))}
+        kept = [True] * len(avail)
+        moved = []
+        for item in prefs:
+            idx = pos.get(item)
+            if idx is None or not kept[idx]: continue
+            kept[idx] = False
+            moved.append(item)
+        if not moved: return
+        list_avail.delete(0, tk.END)
+        list_avail.insert(tk.END, *(item for item, keep in zip(avail, kept) if keep))
+        list_pref.insert(tk.END, *moved)
+        pref.extend(moved)
 
 def _launch_gui():
     if not GUI_AVAILABLE: raise ImportError("Tkinter is required to run the GUI, but it could not be imported.")
     root = tk.Tk()
     app = SorterApp(root)
-    root.mainloop()
+    try: root.mainloop()
+    finally: app.scan_pool.shutdown(wait=False, cancel_futures=True)
 
 # -------------------------------
 # Main — decide GUI vs CLI
@@ -853,4 +1283,5 @@ def main():
         except Exception as e: print(f"❌ Error: {e}")
 
 if __name__ == "__main__":
+    multiprocessing.freeze_support()  # required for worker processes in PyInstaller builds
     main()
\ No newline at end of file